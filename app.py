@@ -7,30 +7,87 @@ Course: Internet of Things
 """
 
 
-CLAUDE_API_KEY = "API KEY(mine is secret)"
+# Cooperative green threads for the monitor, watcher and request handlers.
+# Must run before anything else imports socket/threading.
+import eventlet
+eventlet.monkey_patch()
 
 from flask import Flask, render_template, jsonify, request
+from flask.json.provider import JSONProvider
 from flask_socketio import SocketIO, emit
-import json
-import threading
+from watchdog.observers import Observer
+from watchdog.events import FileSystemEventHandler
+import orjson
+import array
+import collections
+import itertools
+import bisect
 import time
 from datetime import datetime, timedelta
 import os
 from config import *
-from claude_ai import ClaudeAIOptimizer
+from claude_ai import ClaudeAIOptimizer, RollingAnalysis
+
+class ORJSONProvider(JSONProvider):
+    """Flask JSON provider backed by orjson, used by jsonify()"""
+    
+    options = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+    
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, option=self.options).decode()
+    
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+    
+    def response(self, *args, **kwargs):
+        # Hand orjson's bytes straight to the response, skipping the str round trip
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(orjson.dumps(obj, option=self.options),
+                                        mimetype='application/json')
+
+class ORJSONModule:
+    """json-module lookalike so Socket.IO packets are encoded with orjson"""
+    
+    @staticmethod
+    def dumps(obj, *args, **kwargs):
+        return orjson.dumps(obj, option=ORJSONProvider.options).decode()
+    
+    @staticmethod
+    def loads(s, *args, **kwargs):
+        return orjson.loads(s)
 
 app = Flask(__name__)
+app.json = ORJSONProvider(app)
 app.config['SECRET_KEY'] = 'pc-metricsX-dashboard-secret-key'
-socketio = SocketIO(app, cors_allowed_origins="*")
+socketio = SocketIO(app, cors_allowed_origins="*", json=ORJSONModule, async_mode='eventlet')
+
+MAX_HISTORY_POINTS = 1000
+INITIAL_TAIL_BYTES = MAX_HISTORY_POINTS * 512  # ~2x a log record
+ANALYSIS_WINDOW_POINTS = 100
+CERT_RECHECK_TICKS = 60
 
 #  variables for dashboard state
 current_sensor_data = {}
-sensor_history = []
+sensor_history = collections.deque(maxlen=MAX_HISTORY_POINTS)
+_timestamps = array.array('d')  # timestamps of sensor_history, for bisect (O(1) indexing, unlike a deque)
 aws_connection_status = False
 ai_recommendations = {}
 alert_messages = []
 
-claude_optimizer = ClaudeAIOptimizer()
+# incremental log reader state
+_log_offset = 0
+
+# cached certificate check for check_aws_connection
+_cert_ok = None
+_cert_check_ticks = 0
+
+# records ingested so far (keeps counting once the history is full), and the
+# count when the cached AI recommendations were last (re)started
+_records_ingested = 0
+_recommendation_ingested = 0
+
+claude_optimizer = ClaudeAIOptimizer(api_key=os.environ.get('CLAUDE_API_KEY'))
+rolling_analysis = RollingAnalysis(window=ANALYSIS_WINDOW_POINTS)
 
 COMPONENT_MODELS = {
     'cpu': 'AMD Ryzen 9 7950X3D',
@@ -42,101 +99,90 @@ COMPONENT_MODELS = {
     'case_fan': 'Corsair iCUE QL120 RGB'
 }
 
+def _read_new_records():
+    """Parse the records appended to the log file since the last read"""
+    global _log_offset
+    
+    size = os.stat(LOCAL_LOG_FILE).st_size
+    if size < _log_offset:
+        # Log was truncated (simulation restarted) - start over
+        _log_offset = 0
+        sensor_history.clear()
+        del _timestamps[:]
+        rolling_analysis.clear()
+    
+    # On a cold start only the tail of a large log is needed to fill the history
+    if _log_offset == 0:
+        _log_offset = max(0, size - INITIAL_TAIL_BYTES)
+    
+    with open(LOCAL_LOG_FILE, 'rb') as f:
+        f.seek(_log_offset)
+        new = f.read()
+    
+    # One JSON object per line (NDJSON)
+    records = []
+    consumed = 0   # bytes of `new` that are fully processed
+    
+    for line in new.splitlines(keepends=True):
+        if not line.endswith(b'\n'):
+            break  # still being written, pick it up next time
+        consumed += len(line)
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            records.append(orjson.loads(line))
+        except orjson.JSONDecodeError:
+            pass  # skip corrupted entries (or the partial first line of a tail read)
+    
+    _log_offset += consumed
+    return records
+
 def load_sensor_data():
-    """Load recent sensor data from JSON log file"""
-    global sensor_history, current_sensor_data
+    """Load newly appended sensor data from JSON log file"""
+    global current_sensor_data, _records_ingested
     
     try:
-        with open(LOCAL_LOG_FILE, 'r') as f:
-            content = f.read().strip()
-            
-        # Handle incomplete JSON
-        if content and not content.endswith(']'):
-            if content.endswith(','):
-                content = content[:-1]
-            content += '\n]'
-            
-        if content:
-            data = json.loads(content)
-        else:
-            data = []
-            
-        sensor_history = data[-1000:] if len(data) > 1000 else data
+        records = _read_new_records()
+        _records_ingested += len(records)
+        sensor_history.extend(records)
+        _timestamps.extend(record['timestamp'] for record in records)
+        del _timestamps[:len(_timestamps) - len(sensor_history)]  # drop evicted entries in one go
+        for record in records:
+            rolling_analysis.push(record)
 
         if sensor_history:
             current_sensor_data = sensor_history[-1]
             
-        print(f"SUCCESS: Loaded {len(sensor_history)} sensor data points")
+        if records:
+            print(f"SUCCESS: Loaded {len(records)} new sensor data points ({len(sensor_history)} in history)")
         
     except FileNotFoundError:
         print("WARNING: No sensor data file found. Please run simulate_pc_metrics.py first")
-        sensor_history = []
+        sensor_history.clear()
+        del _timestamps[:]
+        rolling_analysis.clear()
         current_sensor_data = {}
-    except json.JSONDecodeError as e:
-        print(f"WARNING: JSON parsing error: {e}")
-        try:
-            sensor_history = load_sensor_data_fallback()
-            if sensor_history:
-                current_sensor_data = sensor_history[-1]
-                print(f"SUCCESS: Fallback loaded {len(sensor_history)} sensor data points")
-            else:
-                current_sensor_data = {}
-        except Exception as fallback_error:
-            print(f"WARNING: Fallback loading failed: {fallback_error}")
-            sensor_history = []
-            current_sensor_data = {}
     except Exception as e:
         print(f"WARNING: Error loading sensor data: {e}")
-        sensor_history = []
-        current_sensor_data = {}
-
-def load_sensor_data_fallback():
-    """Fallback method to load sensor data when JSON is corrupted"""
-    try:
-        with open(LOCAL_LOG_FILE, 'r') as f:
-            content = f.read()
-            
-        # Try to extract JSON objects from the content
-        lines = content.split('\n')
-        json_objects = []
-        
-        for line in lines:
-            line = line.strip()
-            if line.startswith('{') and line.endswith('}'):
-                try:
-                    obj = json.loads(line)
-                    json_objects.append(obj)
-                except json.JSONDecodeError:
-                    continue
-            elif line.startswith('{') and line.endswith(','):
-                try:
-                    obj = json.loads(line[:-1])
-                    json_objects.append(obj)
-                except json.JSONDecodeError:
-                    continue
-        
-        return json_objects
-        
-    except Exception as e:
-        print(f"WARNING: Fallback loading error: {e}")
-        return []
 
 def check_aws_connection():
     """Check AWS IoT connection status"""
-    global aws_connection_status
+    global aws_connection_status, _cert_ok, _cert_check_ticks
     
     try:
-        cert_exists = (os.path.exists(CERTIFICATE_PATH) and 
-                      os.path.exists(PRIVATE_KEY_PATH) and 
-                      os.path.exists(ROOT_CA_PATH))
+        # Certificate files rarely change - only re-stat them every CERT_RECHECK_TICKS calls
+        if _cert_ok is None or _cert_check_ticks >= CERT_RECHECK_TICKS:
+            _cert_ok = (os.path.exists(CERTIFICATE_PATH) and 
+                        os.path.exists(PRIVATE_KEY_PATH) and 
+                        os.path.exists(ROOT_CA_PATH))
+            _cert_check_ticks = 0
+        _cert_check_ticks += 1
         
         # Additional check: verify recent data updates
-        if sensor_history:
-            last_update = datetime.fromtimestamp(sensor_history[-1]['timestamp'])
-            time_diff = datetime.now() - last_update
-            data_fresh = time_diff.total_seconds() < 60
-            
-            aws_connection_status = cert_exists and data_fresh
+        if _timestamps:
+            data_fresh = time.time() - _timestamps[-1] < 60
+            aws_connection_status = _cert_ok and data_fresh
         else:
             aws_connection_status = False
             
@@ -148,16 +194,22 @@ def generate_ai_fan_curves(preference='balanced', sensor_data_sample=None):
     """
     Generate AI-powered fan curve recommendations using Claude API
     """
-    global ai_recommendations
+    global ai_recommendations, _recommendation_ingested
     
-    if not sensor_data_sample:
-        sensor_data_sample = sensor_history[-100:] if len(sensor_history) >= 100 else sensor_history
+    # Cached Claude responses go stale once more than 10% of the history is new
+    if _records_ingested - _recommendation_ingested > 0.1 * len(sensor_history):
+        claude_optimizer.clear_cache()
+        _recommendation_ingested = _records_ingested
     
-    if not sensor_data_sample:
+    if sensor_data_sample:
+        analysis = claude_optimizer.analyze_temperature_data(sensor_data_sample)
+    elif rolling_analysis:
+        # Statistics of the latest window are maintained as data arrives
+        analysis = rolling_analysis.analysis()
+    else:
         return {"error": "No data available for analysis"}
     
     # Claude AI optimizerrr
-    analysis = claude_optimizer.analyze_temperature_data(sensor_data_sample)
     ai_recommendations = claude_optimizer.generate_fan_curves(analysis, preference)
     
     return ai_recommendations
@@ -218,25 +270,58 @@ def generate_simulated_recommendations(preference, temp_analysis):
         'timestamp': datetime.now().isoformat()
     }
 
+def emit_sensor_update():
+    """Push the latest sensor reading to connected clients"""
+    if current_sensor_data:
+        socketio.emit('sensor_update', {
+            'data': current_sensor_data,
+            'aws_status': aws_connection_status,
+            'component_models': COMPONENT_MODELS
+        })
+
+class SensorLogHandler(FileSystemEventHandler):
+    """Reloads sensor data whenever the simulator writes to the log file"""
+    
+    def __init__(self):
+        super().__init__()
+        self.log_path = os.path.abspath(LOCAL_LOG_FILE)
+    
+    def on_modified(self, event):
+        if event.is_directory or os.path.abspath(event.src_path) != self.log_path:
+            return
+        try:
+            load_sensor_data()
+            emit_sensor_update()
+        except Exception as e:
+            print(f"WARNING: Error handling sensor log update: {e}")
+    
+    # A restarted simulation recreates the log file
+    on_created = on_modified
+
 def background_data_monitor():
-    """Background thread to monitor data updates and AWS connection"""
+    """Background heartbeat task to monitor the AWS connection"""
     while True:
         try:
-            load_sensor_data()
+            was_connected = aws_connection_status
             check_aws_connection()
-            
-            # Emit real-time updates to connected clients
-            if current_sensor_data:
-                socketio.emit('sensor_update', {
-                    'data': current_sensor_data,
-                    'aws_status': aws_connection_status,
-                    'component_models': COMPONENT_MODELS
-                })
-                
+            # Log writes push sensor_update themselves, but once the simulator
+            # stops nothing else would tell the clients the status flipped
+            if aws_connection_status != was_connected:
+                emit_sensor_update()
         except Exception as e:
             print(f"WARNING: Error in background monitor: {e}")
             
-        time.sleep(2)  # Update every 2 sec
+        socketio.sleep(5)  # Heartbeat every 5 sec
+
+def start_monitoring():
+    """Start the sensor log watcher and the AWS heartbeat task"""
+    log_dir = os.path.dirname(os.path.abspath(LOCAL_LOG_FILE))
+    observer = Observer()
+    observer.schedule(SensorLogHandler(), log_dir, recursive=False)
+    observer.start()
+    
+    socketio.start_background_task(background_data_monitor)
+    return observer
 
 @app.route('/')
 def dashboard():
@@ -261,7 +346,9 @@ def api_history_data():
     minutes = int(request.args.get('minutes', 30))
     cutoff_time = time.time() - (minutes * 60)
     
-    filtered_data = [d for d in sensor_history if d['timestamp'] >= cutoff_time]
+    # History is in time order, so the window starts at the bisect point
+    idx = bisect.bisect_left(_timestamps, cutoff_time)
+    filtered_data = list(itertools.islice(sensor_history, idx, None))
     
     return jsonify({
         'history': filtered_data,
@@ -316,8 +403,7 @@ if __name__ == '__main__':
     load_sensor_data()
     check_aws_connection()
 
-    monitor_thread = threading.Thread(target=background_data_monitor, daemon=True)
-    monitor_thread.start()
+    start_monitoring()
     
     print("SUCCESS: Dashboard ready at http://localhost:5000")
-    socketio.run(app, debug=True, host='0.0.0.0', port=5000, allow_unsafe_werkzeug=True) 
\ No newline at end of file
+    socketio.run(app, debug=True, host='0.0.0.0', port=5000) 
\ No newline at end of file
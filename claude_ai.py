@@ -7,25 +7,212 @@ Provides intelligent fan curve recommendations based on data analysis.
 import requests
 import json
 import os
+import time
+import math
+import collections
+import functools
+import numpy as np
 from datetime import datetime
 from typing import Dict, List, Optional, Tuple
 
+# numba is optional - without it the statistics fall back to NumPy reductions
+try:
+    from numba import njit
+    numba_available = True
+except ImportError:
+    numba_available = False
+
+# Sensor record fields used by the temperature analysis
+_FIELDS = ('cpu_temp', 'gpu_temp', 'ssd_temp', 'motherboard_temp',
+           'cpu_fan_rpm', 'gpu_fan_rpm', 'case_fan_rpm',
+           'gaming_session', 'gaming_intensity')
+
+# Array type per field: readings carry at most one decimal so float32 is plenty,
+# the session flag fits in a byte and epoch timestamps need full float64
+_FIELD_DTYPES = dict.fromkeys(_FIELDS, np.float32)
+_FIELD_DTYPES['gaming_session'] = np.uint8
+_FIELD_DTYPES['timestamp'] = np.float64
+
+# Temperature and fan fields reduced together as the columns of one matrix
+_MATRIX_FIELDS = ('cpu_temp', 'gpu_temp', 'ssd_temp', 'motherboard_temp',
+                  'cpu_fan_rpm', 'gpu_fan_rpm', 'case_fan_rpm')
+_COL = {field: j for j, field in enumerate(_MATRIX_FIELDS)}
+
+# Base fan curves for different preferences (RPM at each curve point)
+_BASE_CURVE_VALUES = {
+    'best_temps': {
+        'cpu_fan': [800, 1400, 2200, 3600, 4500],
+        'gpu_fan': [0, 1200, 2400, 3900, 4200],
+        'case_fan': [600, 1000, 1600, 2400, 2800]
+    },
+    'most_quiet': {
+        'cpu_fan': [600, 1000, 1600, 2400, 3200],
+        'gpu_fan': [0, 800, 1800, 3000, 3400],
+        'case_fan': [400, 700, 1200, 1800, 2200]
+    },
+    'balanced': {
+        'cpu_fan': [700, 1200, 1900, 3000, 3800],
+        'gpu_fan': [0, 1000, 2100, 3400, 3800],
+        'case_fan': [500, 850, 1400, 2100, 2500]
+    }
+}
+
+BASE_CURVES = {
+    pref: {fan: np.array(rpms, dtype=np.int16) for fan, rpms in fans.items()}
+    for pref, fans in _BASE_CURVE_VALUES.items()
+}
+
+if numba_available:
+    @njit(cache=True, fastmath=True)
+    def _column_stats(m):
+        """
+        Per-column mean, min, max and std of a 2-D array, accumulated in
+        float64 - one pass for sum/min/max, a second for squared deviations
+        """
+        n, k = m.shape
+        s = np.zeros(k)
+        mn = m[0].copy()
+        mx = m[0].copy()
+        for i in range(n):
+            for j in range(k):
+                v = m[i, j]
+                s[j] += np.float64(v)
+                if v < mn[j]:
+                    mn[j] = v
+                if v > mx[j]:
+                    mx[j] = v
+        mean = s / n
+        
+        ss = np.zeros(k)
+        for i in range(n):
+            for j in range(k):
+                d = np.float64(m[i, j]) - mean[j]
+                ss[j] += d * d
+        std = np.sqrt(ss / n)
+        
+        # a constant column has no spread, whatever rounding fastmath allows
+        for j in range(k):
+            if mn[j] == mx[j]:
+                std[j] = 0.0
+        return mean, mn, mx, std
+else:
+    def _column_stats(m):
+        """Per-column mean, min, max and std of a 2-D array (float64 accumulation)"""
+        return (m.mean(axis=0, dtype=np.float64), m.min(axis=0), m.max(axis=0),
+                m.std(axis=0, dtype=np.float64))
+
+class _AnalysisKey:
+    """
+    Cache key for a Claude request: analyses with the same preference and
+    rounded signature are treated as equal, while the full analysis is
+    carried along for building the prompt
+    """
+    __slots__ = ('preference', 'analysis', 'signature')
+    
+    def __init__(self, preference: str, analysis: Dict):
+        self.preference = preference
+        self.analysis = analysis
+        self.signature = (
+            preference,
+            round(analysis['cpu']['avg'], 1),
+            round(analysis['gpu']['avg'], 1),
+            analysis['gaming']['sessions']
+        )
+    
+    def __hash__(self):
+        return hash(self.signature)
+    
+    def __eq__(self, other):
+        return isinstance(other, _AnalysisKey) and self.signature == other.signature
+
 class ClaudeAIOptimizer:
     """
     AI-powered fan curve optimizer using Claude API
     """
     
+    # Static prompt scaffolding, filled in by _build_claude_prompt
+    _PROMPT_TMPL = """
+        You are an expert PC cooling specialist. Analyze this gaming PC's temperature data and provide optimized fan curve recommendations.
+
+        SYSTEM SPECIFICATIONS:
+        - CPU: {cpu_spec}
+        - GPU: {gpu_spec}
+        - CPU Cooler: {cooler_spec}
+        - Case: Gaming case with good airflow
+
+        TEMPERATURE ANALYSIS ({data_points} data points over {time_span_hours:.1f} hours):
+        - CPU: Avg {cpu_avg:.1f}°C, Max {cpu_max:.1f}°C, Min {cpu_min:.1f}°C
+        - GPU: Avg {gpu_avg:.1f}°C, Max {gpu_max:.1f}°C, Min {gpu_min:.1f}°C
+        - SSD: Avg {ssd_avg:.1f}°C, Max {ssd_max:.1f}°C
+        - Motherboard: Avg {mb_avg:.1f}°C, Max {mb_max:.1f}°C
+
+        CURRENT FAN PERFORMANCE:
+        - CPU Fan: Avg {cpu_fan_avg:.0f} RPM, Max {cpu_fan_max:.0f} RPM
+        - GPU Fan: Avg {gpu_fan_avg:.0f} RPM, Max {gpu_fan_max:.0f} RPM
+        - Case Fan: Avg {case_fan_avg:.0f} RPM, Max {case_fan_max:.0f} RPM
+
+        GAMING USAGE:
+        - Gaming sessions: {gaming_sessions} ({gaming_percentage:.1f}% of time)
+        - Average gaming intensity: {gaming_avg_intensity:.2f}
+
+        USER PREFERENCE: {preference}
+        - 'balanced': Balance between cooling performance and noise
+        - 'best_temps': Prioritize lowest temperatures (aggressive cooling)
+        - 'most_quiet': Prioritize noise reduction (conservative cooling)
+
+        Please provide optimized fan curves for each component:
+        1. CPU Fan curve (RPM values for: 30°C, 50°C, 70°C, 85°C, 95°C)
+        2. GPU Fan curve (RPM values for: 30°C, 50°C, 70°C, 85°C, 90°C)
+        3. Case Fan curve (RPM values for: 30°C, 50°C, 70°C, 85°C, 90°C)
+
+        Also provide:
+        - Analysis of current cooling efficiency
+        - Specific recommendations for this user's usage pattern
+        - Expected temperature improvements
+        - Noise level considerations
+
+        Format your response as JSON with the following structure:
+        {{
+            "fan_curves": {{
+                "cpu_fan": [rpm1, rpm2, rpm3, rpm4, rpm5],
+                "gpu_fan": [rpm1, rpm2, rpm3, rpm4, rpm5],
+                "case_fan": [rpm1, rpm2, rpm3, rpm4, rpm5]
+            }},
+            "analysis": {{
+                "efficiency": "Current cooling efficiency assessment",
+                "recommendations": "Specific recommendations",
+                "temperature_improvement": "Expected improvements",
+                "noise_impact": "Noise level considerations"
+            }}
+        }}
+        """
+    
     def __init__(self, api_key: Optional[str] = None):
         self.api_key = api_key or os.getenv('CLAUDE_API_KEY')
         self.api_url = "https://api.anthropic.com/v1/messages"
         self.model = "claude-3-sonnet-20240229"
         
-        if not self.api_key:
+        # One keep-alive session so repeated calls reuse the TLS connection
+        self.session = requests.Session()
+        self.session.headers.update({
+            'Content-Type': 'application/json',
+            'X-API-Key': self.api_key or '',
+            'anthropic-version': '2023-06-01'
+        })
+        
+        # Without a key every request goes straight to the simulated curves
+        self.use_simulation = not bool(self.api_key)
+        if self.use_simulation:
             print("WARNING: Claude API key not found. Using simulated AI recommendations.")
-            self.use_simulation = True
         else:
             print("SUCCESS: Claude AI optimizer initialized")
-            self.use_simulation = False
+        
+        # Consecutive API failures and when the API may be tried again
+        self._fail_count = 0
+        self._next_retry = 0.0
+        
+        # Claude responses keyed on (preference, rounded analysis signature)
+        self._cached_claude_response = functools.lru_cache(maxsize=64)(self._request_claude_response)
     
     def analyze_temperature_data(self, sensor_data: List[Dict]) -> Dict:
         """
@@ -34,71 +221,47 @@ class ClaudeAIOptimizer:
         if not sensor_data:
             return {}
         
-        # Extract temperature data
-        cpu_temps = [d.get('cpu_temp', 0) for d in sensor_data]
-        gpu_temps = [d.get('gpu_temp', 0) for d in sensor_data]
-        ssd_temps = [d.get('ssd_temp', 0) for d in sensor_data]
-        mb_temps = [d.get('motherboard_temp', 0) for d in sensor_data]
+        # Temperatures and fan speeds as one (N, 7) float32 matrix, reduced in a single pass
+        n = len(sensor_data)
+        matrix = np.array([[d.get(field, 0) for field in _MATRIX_FIELDS] for d in sensor_data],
+                          dtype=np.float32)
+        means, mins, maxs, stds = _column_stats(matrix)
+        
+        # The remaining fields keep their own array types
+        columns = {
+            field: np.fromiter((d.get(field, 0) for d in sensor_data), dtype=_FIELD_DTYPES[field], count=n)
+            for field in ('gaming_session', 'gaming_intensity', 'timestamp')
+        }
+        
+        def temp_stats(field):
+            j = _COL[field]
+            return {'avg': float(means[j]), 'max': float(maxs[j]), 'min': float(mins[j]), 'std': float(stds[j])}
         
-        # Extract fan data
-        cpu_fan_rpms = [d.get('cpu_fan_rpm', 0) for d in sensor_data]
-        gpu_fan_rpms = [d.get('gpu_fan_rpm', 0) for d in sensor_data]
-        case_fan_rpms = [d.get('case_fan_rpm', 0) for d in sensor_data]
+        def fan_stats(field):
+            j = _COL[field]
+            return {'avg': float(means[j]), 'max': float(maxs[j]), 'min': float(mins[j])}
         
         # Gaming session analysis
-        gaming_sessions = sum(1 for d in sensor_data if d.get('gaming_session', False))
-        gaming_intensity_avg = sum(d.get('gaming_intensity', 0) for d in sensor_data) / len(sensor_data)
+        gaming_sessions = int(columns['gaming_session'].sum())
         
         # Calculate statistics
         analysis = {
-            'cpu': {
-                'avg': sum(cpu_temps) / len(cpu_temps),
-                'max': max(cpu_temps),
-                'min': min(cpu_temps),
-                'std': self._calculate_std(cpu_temps)
-            },
-            'gpu': {
-                'avg': sum(gpu_temps) / len(gpu_temps),
-                'max': max(gpu_temps),
-                'min': min(gpu_temps),
-                'std': self._calculate_std(gpu_temps)
-            },
-            'ssd': {
-                'avg': sum(ssd_temps) / len(ssd_temps),
-                'max': max(ssd_temps),
-                'min': min(ssd_temps),
-                'std': self._calculate_std(ssd_temps)
-            },
-            'motherboard': {
-                'avg': sum(mb_temps) / len(mb_temps),
-                'max': max(mb_temps),
-                'min': min(mb_temps),
-                'std': self._calculate_std(mb_temps)
-            },
+            'cpu': temp_stats('cpu_temp'),
+            'gpu': temp_stats('gpu_temp'),
+            'ssd': temp_stats('ssd_temp'),
+            'motherboard': temp_stats('motherboard_temp'),
             'fans': {
-                'cpu_fan': {
-                    'avg': sum(cpu_fan_rpms) / len(cpu_fan_rpms),
-                    'max': max(cpu_fan_rpms),
-                    'min': min(cpu_fan_rpms)
-                },
-                'gpu_fan': {
-                    'avg': sum(gpu_fan_rpms) / len(gpu_fan_rpms),
-                    'max': max(gpu_fan_rpms),
-                    'min': min(gpu_fan_rpms)
-                },
-                'case_fan': {
-                    'avg': sum(case_fan_rpms) / len(case_fan_rpms),
-                    'max': max(case_fan_rpms),
-                    'min': min(case_fan_rpms)
-                }
+                'cpu_fan': fan_stats('cpu_fan_rpm'),
+                'gpu_fan': fan_stats('gpu_fan_rpm'),
+                'case_fan': fan_stats('case_fan_rpm')
             },
             'gaming': {
                 'sessions': gaming_sessions,
-                'avg_intensity': gaming_intensity_avg,
-                'gaming_percentage': (gaming_sessions / len(sensor_data)) * 100
+                'avg_intensity': float(columns['gaming_intensity'].mean()),
+                'gaming_percentage': (gaming_sessions / n) * 100
             },
-            'data_points': len(sensor_data),
-            'time_span_hours': self._calculate_time_span(sensor_data)
+            'data_points': n,
+            'time_span_hours': self._calculate_time_span(columns['timestamp'])
         }
         
         return analysis
@@ -116,105 +279,87 @@ class ClaudeAIOptimizer:
         """
         Generate fan curves using Claude AI API
         """
+        # Circuit breaker: while backing off after failures, skip the API entirely
+        if time.monotonic() < self._next_retry:
+            return self._generate_simulated_curves(analysis, preference)
+        
         try:
-            # Prepare the prompt for Claude
-            prompt = self._build_claude_prompt(analysis, preference)
-            
-            # Make API request to Claude
-            headers = {
-                'Content-Type': 'application/json',
-                'X-API-Key': self.api_key,
-                'anthropic-version': '2023-06-01'
-            }
-            
-            payload = {
-                'model': self.model,
-                'max_tokens': 1000,
-                'messages': [
-                    {
-                        'role': 'user',
-                        'content': prompt
-                    }
-                ]
-            }
+            # Similar analyses share one cached Claude response
+            claude_response = self._cached_claude_response(_AnalysisKey(preference, analysis))
+            self._fail_count = 0
             
-            response = requests.post(self.api_url, headers=headers, json=payload, timeout=30)
-            
-            if response.status_code == 200:
-                result = response.json()
-                claude_response = result['content'][0]['text']
-                
-                # Parse Claude's response
-                return self._parse_claude_response(claude_response, analysis, preference)
-            else:
-                print(f"WARNING: Claude API error: {response.status_code}")
-                return self._generate_simulated_curves(analysis, preference)
+            # Parse Claude's response
+            return self._parse_claude_response(claude_response, analysis, preference)
                 
         except Exception as e:
+            self._fail_count += 1
+            self._next_retry = time.monotonic() + min(60, 2 ** self._fail_count)
             print(f"WARNING: Claude AI error: {e}")
             return self._generate_simulated_curves(analysis, preference)
     
+    def _request_claude_response(self, key: '_AnalysisKey') -> str:
+        """
+        Ask Claude for fan curves and return the raw response text.
+        Raises on failure so that errors are never cached.
+        """
+        # Prepare the prompt for Claude
+        prompt = self._build_claude_prompt(key.analysis, key.preference)
+        
+        # Make API request to Claude
+        payload = {
+            'model': self.model,
+            'max_tokens': 1000,
+            'messages': [
+                {
+                    'role': 'user',
+                    'content': prompt
+                }
+            ]
+        }
+        
+        # Under the dashboard's eventlet loop this only blocks the calling green thread.
+        # Fail fast if the API is unreachable, but give the (non-streamed) reply time to generate
+        response = self.session.post(self.api_url, json=payload, timeout=(5, 30))
+        
+        if response.status_code != 200:
+            raise RuntimeError(f"Claude API returned status {response.status_code}")
+        
+        result = response.json()
+        return result['content'][0]['text']
+    
+    def clear_cache(self):
+        """Drop all cached Claude responses"""
+        self._cached_claude_response.cache_clear()
+    
     def _build_claude_prompt(self, analysis: Dict, preference: str) -> str:
         """
         Build the prompt for Claude AI
         """
-        prompt = f"""
-        You are an expert PC cooling specialist. Analyze this gaming PC's temperature data and provide optimized fan curve recommendations.
-
-        SYSTEM SPECIFICATIONS:
-        - CPU: {analysis.get('cpu', {}).get('avg', 'High-end Gaming CPU')}
-        - GPU: {analysis.get('gpu', {}).get('avg', 'High-end Gaming GPU')}
-        - CPU Cooler: {analysis.get('fans', {}).get('cpu_fan', {}).get('avg', 'High-performance Air Cooler')}
-        - Case: Gaming case with good airflow
-
-        TEMPERATURE ANALYSIS ({analysis.get('data_points', 0)} data points over {analysis.get('time_span_hours', 0):.1f} hours):
-        - CPU: Avg {analysis['cpu']['avg']:.1f}°C, Max {analysis['cpu']['max']:.1f}°C, Min {analysis['cpu']['min']:.1f}°C
-        - GPU: Avg {analysis['gpu']['avg']:.1f}°C, Max {analysis['gpu']['max']:.1f}°C, Min {analysis['gpu']['min']:.1f}°C
-        - SSD: Avg {analysis['ssd']['avg']:.1f}°C, Max {analysis['ssd']['max']:.1f}°C
-        - Motherboard: Avg {analysis['motherboard']['avg']:.1f}°C, Max {analysis['motherboard']['max']:.1f}°C
-
-        CURRENT FAN PERFORMANCE:
-        - CPU Fan: Avg {analysis['fans']['cpu_fan']['avg']:.0f} RPM, Max {analysis['fans']['cpu_fan']['max']:.0f} RPM
-        - GPU Fan: Avg {analysis['fans']['gpu_fan']['avg']:.0f} RPM, Max {analysis['fans']['gpu_fan']['max']:.0f} RPM
-        - Case Fan: Avg {analysis['fans']['case_fan']['avg']:.0f} RPM, Max {analysis['fans']['case_fan']['max']:.0f} RPM
-
-        GAMING USAGE:
-        - Gaming sessions: {analysis['gaming']['sessions']} ({analysis['gaming']['gaming_percentage']:.1f}% of time)
-        - Average gaming intensity: {analysis['gaming']['avg_intensity']:.2f}
-
-        USER PREFERENCE: {preference}
-        - 'balanced': Balance between cooling performance and noise
-        - 'best_temps': Prioritize lowest temperatures (aggressive cooling)
-        - 'most_quiet': Prioritize noise reduction (conservative cooling)
-
-        Please provide optimized fan curves for each component:
-        1. CPU Fan curve (RPM values for: 30°C, 50°C, 70°C, 85°C, 95°C)
-        2. GPU Fan curve (RPM values for: 30°C, 50°C, 70°C, 85°C, 90°C)
-        3. Case Fan curve (RPM values for: 30°C, 50°C, 70°C, 85°C, 90°C)
-
-        Also provide:
-        - Analysis of current cooling efficiency
-        - Specific recommendations for this user's usage pattern
-        - Expected temperature improvements
-        - Noise level considerations
-
-        Format your response as JSON with the following structure:
-        {{
-            "fan_curves": {{
-                "cpu_fan": [rpm1, rpm2, rpm3, rpm4, rpm5],
-                "gpu_fan": [rpm1, rpm2, rpm3, rpm4, rpm5],
-                "case_fan": [rpm1, rpm2, rpm3, rpm4, rpm5]
-            }},
-            "analysis": {{
-                "efficiency": "Current cooling efficiency assessment",
-                "recommendations": "Specific recommendations",
-                "temperature_improvement": "Expected improvements",
-                "noise_impact": "Noise level considerations"
-            }}
-        }}
-        """
+        cpu, gpu = analysis['cpu'], analysis['gpu']
+        ssd, mb = analysis['ssd'], analysis['motherboard']
+        gaming = analysis['gaming']
+        cpu_fan, gpu_fan, case_fan = (analysis['fans'][fan] for fan in ('cpu_fan', 'gpu_fan', 'case_fan'))
+        
+        flat = {
+            'cpu_spec': cpu.get('avg', 'High-end Gaming CPU'),
+            'gpu_spec': gpu.get('avg', 'High-end Gaming GPU'),
+            'cooler_spec': cpu_fan.get('avg', 'High-performance Air Cooler'),
+            'data_points': analysis.get('data_points', 0),
+            'time_span_hours': analysis.get('time_span_hours', 0),
+            'cpu_avg': cpu['avg'], 'cpu_max': cpu['max'], 'cpu_min': cpu['min'],
+            'gpu_avg': gpu['avg'], 'gpu_max': gpu['max'], 'gpu_min': gpu['min'],
+            'ssd_avg': ssd['avg'], 'ssd_max': ssd['max'],
+            'mb_avg': mb['avg'], 'mb_max': mb['max'],
+            'cpu_fan_avg': cpu_fan['avg'], 'cpu_fan_max': cpu_fan['max'],
+            'gpu_fan_avg': gpu_fan['avg'], 'gpu_fan_max': gpu_fan['max'],
+            'case_fan_avg': case_fan['avg'], 'case_fan_max': case_fan['max'],
+            'gaming_sessions': gaming['sessions'],
+            'gaming_percentage': gaming['gaming_percentage'],
+            'gaming_avg_intensity': gaming['avg_intensity'],
+            'preference': preference
+        }
         
-        return prompt
+        return self._PROMPT_TMPL.format_map(flat)
     
     def _parse_claude_response(self, response: str, analysis: Dict, preference: str) -> Dict:
         """
@@ -255,41 +400,22 @@ class ClaudeAIOptimizer:
         """
         Generate simulated fan curves when Claude AI is not available
         """
-        # Base fan curves for different preferences
-        base_curves = {
-            'best_temps': {
-                'cpu_fan': [800, 1400, 2200, 3600, 4500],
-                'gpu_fan': [0, 1200, 2400, 3900, 4200],
-                'case_fan': [600, 1000, 1600, 2400, 2800]
-            },
-            'most_quiet': {
-                'cpu_fan': [600, 1000, 1600, 2400, 3200],
-                'gpu_fan': [0, 800, 1800, 3000, 3400],
-                'case_fan': [400, 700, 1200, 1800, 2200]
-            },
-            'balanced': {
-                'cpu_fan': [700, 1200, 1900, 3000, 3800],
-                'gpu_fan': [0, 1000, 2100, 3400, 3800],
-                'case_fan': [500, 850, 1400, 2100, 2500]
-            }
-        }
-        
-        # Adjust curves based on analysis
-        curves = base_curves[preference].copy()
+        # Adjust a private copy of the base curves for this analysis
+        curves = {fan: rpms.copy() for fan, rpms in BASE_CURVES[preference].items()}
         
         # If temperatures are consistently high, increase fan speeds
         if analysis.get('cpu', {}).get('avg', 0) > 70:
-            curves['cpu_fan'] = [rpm + 200 for rpm in curves['cpu_fan']]
+            np.add(curves['cpu_fan'], 200, out=curves['cpu_fan'])
         if analysis.get('gpu', {}).get('avg', 0) > 75:
-            curves['gpu_fan'] = [rpm + 200 for rpm in curves['gpu_fan']]
+            np.add(curves['gpu_fan'], 200, out=curves['gpu_fan'])
             
         # If gaming intensity is high, boost cooling
         if analysis.get('gaming', {}).get('avg_intensity', 0) > 0.7:
-            curves['case_fan'] = [rpm + 150 for rpm in curves['case_fan']]
+            np.add(curves['case_fan'], 150, out=curves['case_fan'])
         
         return {
             'preference': preference,
-            'fan_curves': curves,
+            'fan_curves': {fan: rpms.tolist() for fan, rpms in curves.items()},
             'analysis': analysis,
             'recommendations': {
                 'cpu': f"CPU averaging {analysis.get('cpu', {}).get('avg', 0):.1f}°C - " + 
@@ -303,23 +429,146 @@ class ClaudeAIOptimizer:
             'ai_generated': False
         }
     
-    def _calculate_std(self, values: List[float]) -> float:
-        """Calculate standard deviation"""
-        if not values:
-            return 0
-        mean = sum(values) / len(values)
-        variance = sum((x - mean) ** 2 for x in values) / len(values)
-        return variance ** 0.5
-    
-    def _calculate_time_span(self, sensor_data: List[Dict]) -> float:
+    def _calculate_time_span(self, timestamps: np.ndarray) -> float:
         """Calculate time span of data in hours"""
-        if len(sensor_data) < 2:
+        if len(timestamps) < 2:
             return 0
         
-        timestamps = [d.get('timestamp', 0) for d in sensor_data]
-        time_span_seconds = max(timestamps) - min(timestamps)
+        time_span_seconds = float(timestamps.max() - timestamps.min())
         return time_span_seconds / 3600  # Convert to hours
 
+class RollingStats:
+    """
+    Mean/std/min/max of a sliding window, updated in O(1) per sample
+    """
+    __slots__ = ('n', 's', 's2', 'buf', '_min_q', '_max_q', '_count')
+    
+    def __init__(self, window: int = 100):
+        self.buf = collections.deque(maxlen=window)
+        self.clear()
+    
+    def clear(self):
+        self.buf.clear()
+        self.n = 0
+        self.s = 0.0
+        self.s2 = 0.0
+        # monotonic deques of (sample index, value) for the window min/max
+        self._min_q = collections.deque()
+        self._max_q = collections.deque()
+        self._count = 0
+    
+    def push(self, x: float):
+        buf = self.buf
+        if self.n == buf.maxlen:
+            old = buf[0]
+            self.s -= old
+            self.s2 -= old * old
+        else:
+            self.n += 1
+        buf.append(x)
+        self.s += x
+        self.s2 += x * x
+        
+        idx = self._count
+        self._count += 1
+        if idx % buf.maxlen == 0:
+            # Re-sum once per window to stop floating point drift building up
+            self.s = float(sum(buf))
+            self.s2 = float(sum(v * v for v in buf))
+        
+        min_q, max_q = self._min_q, self._max_q
+        while min_q and min_q[-1][1] >= x:
+            min_q.pop()
+        min_q.append((idx, x))
+        while max_q and max_q[-1][1] <= x:
+            max_q.pop()
+        max_q.append((idx, x))
+        
+        oldest = idx - self.n + 1
+        if min_q[0][0] < oldest:
+            min_q.popleft()
+        if max_q[0][0] < oldest:
+            max_q.popleft()
+    
+    @property
+    def mean(self) -> float:
+        return self.s / self.n if self.n else 0.0
+    
+    @property
+    def std(self) -> float:
+        if not self.n or self.min == self.max:
+            return 0.0  # s2/n - mean^2 cancels to rounding noise for constant data
+        mean = self.s / self.n
+        return math.sqrt(max(0.0, self.s2 / self.n - mean * mean))
+    
+    @property
+    def min(self) -> float:
+        return self._min_q[0][1] if self._min_q else 0.0
+    
+    @property
+    def max(self) -> float:
+        return self._max_q[0][1] if self._max_q else 0.0
+
+class RollingAnalysis:
+    """
+    Keeps RollingStats for every analysed field so the temperature
+    analysis of the latest window is available without a pass over the data
+    """
+    
+    def __init__(self, window: int = 100):
+        self.stats = {field: RollingStats(window) for field in _FIELDS + ('timestamp',)}
+    
+    def __len__(self) -> int:
+        return self.stats['timestamp'].n
+    
+    def clear(self):
+        for stats in self.stats.values():
+            stats.clear()
+    
+    def push(self, record: Dict):
+        for field, stats in self.stats.items():
+            stats.push(float(record.get(field, 0)))
+    
+    def analysis(self) -> Dict:
+        """
+        Same structure as ClaudeAIOptimizer.analyze_temperature_data
+        """
+        n = len(self)
+        if not n:
+            return {}
+        
+        stats = self.stats
+        
+        def temp_stats(field):
+            st = stats[field]
+            return {'avg': st.mean, 'max': st.max, 'min': st.min, 'std': st.std}
+        
+        def fan_stats(field):
+            st = stats[field]
+            return {'avg': st.mean, 'max': st.max, 'min': st.min}
+        
+        gaming_sessions = int(round(stats['gaming_session'].s))
+        timestamps = stats['timestamp']
+        
+        return {
+            'cpu': temp_stats('cpu_temp'),
+            'gpu': temp_stats('gpu_temp'),
+            'ssd': temp_stats('ssd_temp'),
+            'motherboard': temp_stats('motherboard_temp'),
+            'fans': {
+                'cpu_fan': fan_stats('cpu_fan_rpm'),
+                'gpu_fan': fan_stats('gpu_fan_rpm'),
+                'case_fan': fan_stats('case_fan_rpm')
+            },
+            'gaming': {
+                'sessions': gaming_sessions,
+                'avg_intensity': stats['gaming_intensity'].mean,
+                'gaming_percentage': (gaming_sessions / n) * 100
+            },
+            'data_points': n,
+            'time_span_hours': (timestamps.max - timestamps.min) / 3600 if n >= 2 else 0
+        }
+
 # Example usage
 if __name__ == "__main__":
     # Example sensor data
@@ -17,12 +17,17 @@ PRIVATE_KEY_PATH = "certificates/GamingPC4.private.key"
 CLIENT_ID = "GamingPC4"
 MQTT_TOPIC = "gamingPC/telemetry"
 MQTT_PORT = 8883
+PUBLISH_QOS = 1                # 1 = guaranteed delivery, 0 = fire-and-forget (bulk uploads)
+PUBLISH_BATCH_SIZE = 1         # readings per MQTT message (1 = publish every reading on its own)
+PUBLISH_BATCH_MAX_DELAY = 5.0  # seconds a partial batch may wait before it is sent anyway
+COMPRESS_MQTT_PAYLOAD = False  # zlib-compress published JSON (subscribers must inflate it)
 
 # simulation configuration
 SENSOR_UPDATE_INTERVAL = 1.0  # seconds between sensor readings
 ENABLE_CONSOLE_OUTPUT = True   # print sensor data to console
 ENABLE_LOCAL_LOGGING = True    # save data to local JSON file
 LOCAL_LOG_FILE = "sensor_data_log.json"
+COMPRESS_LOCAL_LOG = False     # gzip the local log to LOCAL_LOG_FILE + ".gz" (the live dashboard reads the plain log)
 
 # temperature simulation parameters (Celsius)
 COMPONENT_IDLE_TEMPS = {